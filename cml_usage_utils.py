@@ -4,22 +4,45 @@ Shared functions for CML usage data collection and processing
 """
 
 import cmlapi
+import functools
 from datetime import datetime, timedelta
 import json
+import numpy as np
 import pandas as pd
+from dateutil import tz
 from calendar import monthrange
 import os
 import sys
 
+try:
+    import orjson  # Optional: much faster JSON serialization when installed
+except ImportError:
+    orjson = None
+
+REPORTS_DIR = 'reports'
+JSON_WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+@functools.lru_cache(maxsize=None)
 def get_cml_client():
-    """Initialize CML API client"""
+    """Initialize CML API client (created once and reused)"""
     try:
-        return cmlapi.default_client()
+        client = cmlapi.default_client()
     except Exception as e:
         print(f"ERROR: Failed to initialize CML client: {e}")
         sys.exit(1)
+    
+    # Usage responses are verbose JSON - ask for gzip, which urllib3 decodes
+    # transparently. Connections stay pooled because the client is reused.
+    client.api_client.set_default_header('Accept-Encoding', 'gzip')
+    return client
+
+@functools.lru_cache(maxsize=None)
+def _ensure_reports_dir():
+    """Create the reports directory on first use and return its path"""
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    return REPORTS_DIR
 
-def get_resource_usage_data(series_type, start_date, end_date):
+def get_resource_usage_data(series_type, start_date, end_date, client=None, include_raw=False):
     """
     Get resource usage data for a specific time period
     
@@ -27,12 +50,16 @@ def get_resource_usage_data(series_type, start_date, end_date):
         series_type (str): 'cpu', 'memory', or 'gpu'
         start_date (datetime): Start date
         end_date (datetime): End date
+        client: Optional CML API client to reuse (created if not given)
+        include_raw (bool): Also return the unprocessed API response as 'raw_result'
     
     Returns:
-        dict: Processed usage data with timestamps and values
+        dict: Processed usage data; 'data_points' is a DataFrame with
+            timestamp, timestamp_str, count and raw_timestamp columns
     """
     
-    client = get_cml_client()
+    if client is None:
+        client = get_cml_client()
     
     # Format time range
     time_range = {
@@ -57,34 +84,51 @@ def get_resource_usage_data(series_type, start_date, end_date):
         # Extract the time series values
         raw_values = result_dict['result']['values']
         
-        # Process the data
-        processed_data = []
-        for item in raw_values:
-            # Convert timestamp from milliseconds to datetime
-            timestamp_ms = int(item['time_stamp'])
-            timestamp_dt = datetime.fromtimestamp(timestamp_ms / 1000)
-            
-            processed_data.append({
-                'timestamp': timestamp_dt,
-                'timestamp_str': timestamp_dt.isoformat(),
-                'count': int(item['count']),
-                'raw_timestamp': item['time_stamp']
-            })
+        # Process the data as whole arrays rather than one dict per point
+        raw_timestamps = np.array([item['time_stamp'] for item in raw_values], dtype=object)
+        timestamps_ms = raw_timestamps.astype(np.int64)
+        counts = np.array([item['count'] for item in raw_values], dtype=np.int64)
+        
+        # Sort by timestamp on the raw int64 values; the API normally returns
+        # points in order already, in which case the sort is skipped
+        if (np.diff(timestamps_ms) < 0).any():
+            order = np.argsort(timestamps_ms, kind='stable')
+            timestamps_ms = timestamps_ms[order]
+            counts = counts[order]
+            raw_timestamps = raw_timestamps[order]
+        
+        # Convert timestamps from milliseconds to local datetimes, like datetime.fromtimestamp
+        timestamps = (
+            pd.to_datetime(timestamps_ms, unit='ms', utc=True)
+            .tz_convert(tz.tzlocal())
+            .tz_localize(None)
+        )
+        # Match datetime.isoformat(): only points with a sub-second part get
+        # fractional digits
+        timestamp_values = timestamps.to_numpy()
+        timestamp_strs = np.datetime_as_string(timestamp_values, unit='s').astype(object)
+        fractional = (timestamps_ms % 1000) != 0
+        if fractional.any():
+            timestamp_strs[fractional] = np.datetime_as_string(timestamp_values[fractional], unit='us')
         
-        # Sort by timestamp
-        processed_data.sort(key=lambda x: x['timestamp'])
+        processed_data = pd.DataFrame({
+            'timestamp': timestamps,
+            'timestamp_str': timestamp_strs,
+            'count': counts,
+            'raw_timestamp': raw_timestamps
+        })
         
         # Calculate statistics
-        if processed_data:
-            counts = [item['count'] for item in processed_data]
+        if not processed_data.empty:
+            counts = processed_data['count'].to_numpy()
             stats = {
                 'total_data_points': len(processed_data),
-                'min_count': min(counts),
-                'max_count': max(counts),
-                'avg_count': sum(counts) / len(counts),
-                'total_count': sum(counts),
-                'first_timestamp': processed_data[0]['timestamp_str'],
-                'last_timestamp': processed_data[-1]['timestamp_str']
+                'min_count': int(counts.min()),
+                'max_count': int(counts.max()),
+                'avg_count': float(counts.mean()),
+                'total_count': int(counts.sum()),
+                'first_timestamp': processed_data['timestamp_str'].iloc[0],
+                'last_timestamp': processed_data['timestamp_str'].iloc[-1]
             }
         else:
             stats = {
@@ -99,14 +143,19 @@ def get_resource_usage_data(series_type, start_date, end_date):
         
         print(f"✅ {series_type}: {stats['total_data_points']} data points, avg={stats['avg_count']:.1f}")
         
-        return {
+        usage_data = {
             'success': True,
             'series_type': series_type,
             'data_points': processed_data,
-            'statistics': stats,
-            'raw_result': result_dict
+            'statistics': stats
         }
         
+        # The raw response duplicates data_points and bloats the JSON report, so only keep it on request
+        if include_raw:
+            usage_data['raw_result'] = result_dict
+        
+        return usage_data
+        
     except Exception as e:
         print(f"❌ {series_type} failed: {e}")
         return {
@@ -118,18 +167,16 @@ def get_resource_usage_data(series_type, start_date, end_date):
 def export_to_csv(usage_data, filename):
     """Export usage data to CSV file"""
     try:
-        if not usage_data['data_points']:
+        if usage_data['data_points'].empty:
             print(f"No data to export for {filename}")
             return False
             
-        # Create DataFrame
-        df = pd.DataFrame(usage_data['data_points'])
-        df = df[['timestamp_str', 'count']]  # Keep only essential columns
+        # Keep only essential columns
+        df = usage_data['data_points'][['timestamp_str', 'count']]
         df.columns = ['timestamp', f"{usage_data['series_type']}_count"]
         
         # Ensure reports directory exists and prepend to filename
-        os.makedirs('reports', exist_ok=True)
-        filepath = os.path.join('reports', filename)
+        filepath = os.path.join(_ensure_reports_dir(), filename)
         
         # Export to CSV
         df.to_csv(filepath, index=False)
@@ -143,28 +190,27 @@ def export_to_csv(usage_data, filename):
 def create_combined_csv(resource_data_list, filename):
     """Create combined CSV with all resource types"""
     try:
-        combined_data = []
-        
-        for usage_data in resource_data_list:
-            if usage_data['success']:
-                for point in usage_data['data_points']:
-                    combined_data.append({
-                        'timestamp': point['timestamp_str'],
-                        'resource_type': usage_data['series_type'],
-                        'count': point['count']
-                    })
-        
-        if not combined_data:
+        # One timestamp-indexed series per resource, aligned side by side
+        series_list = [
+            pd.Series(
+                usage_data['data_points']['count'].to_numpy(),
+                index=usage_data['data_points']['timestamp_str'].to_numpy(),
+                name=usage_data['series_type']
+            )
+            for usage_data in resource_data_list
+            if usage_data['success'] and not usage_data['data_points'].empty
+        ]
+        
+        if not series_list:
             print("No data to create combined CSV")
             return False
             
-        # Create DataFrame and pivot
-        df = pd.DataFrame(combined_data)
-        pivot_df = df.pivot(index='timestamp', columns='resource_type', values='count').fillna(0)
+        # Same layout as a timestamp x resource_type pivot, without the long->wide reshape
+        pivot_df = pd.concat(series_list, axis=1).sort_index().sort_index(axis=1).fillna(0)
+        pivot_df.index.name = 'timestamp'
         
         # Ensure reports directory exists and prepend to filename
-        os.makedirs('reports', exist_ok=True)
-        filepath = os.path.join('reports', filename)
+        filepath = os.path.join(_ensure_reports_dir(), filename)
         
         # Export
         pivot_df.to_csv(filepath)
@@ -175,15 +221,32 @@ def create_combined_csv(resource_data_list, filename):
         print(f"❌ Combined CSV creation failed: {e}")
         return False
 
+def _json_default(obj):
+    """Serialize values JSON can't handle: DataFrames as lists of records, anything else as str"""
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict(orient='records')
+    return str(obj)
+
 def save_report_json(report_data, filename):
     """Save full report as JSON"""
     try:
         # Ensure reports directory exists and prepend to filename
-        os.makedirs('reports', exist_ok=True)
-        filepath = os.path.join('reports', filename)
+        filepath = os.path.join(_ensure_reports_dir(), filename)
         
-        with open(filepath, 'w') as f:
-            json.dump(report_data, f, indent=2, default=str)
+        if orjson is not None:
+            # Serialize in C and write the encoded bytes in one go; datetimes are
+            # passed through to the default hook so output matches the json fallback
+            data = orjson.dumps(
+                report_data,
+                default=_json_default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY
+            )
+            with open(filepath, 'wb') as f:
+                f.write(data)
+        else:
+            # Large write buffer so json.dump's many small writes become few syscalls
+            with open(filepath, 'w', buffering=JSON_WRITE_BUFFER_SIZE) as f:
+                json.dump(report_data, f, indent=2, default=_json_default)
         print(f"📁 Report JSON: {filepath}")
         return True
     except Exception as e:
@@ -196,9 +259,9 @@ def send_notification(message, subject="CML Usage Report"):
     print(f"📧 {message}")
     # TODO: Add actual email/Slack notification logic here
 
-def get_last_month_dates():
-    """Get start and end dates for last month"""
-    now = datetime.now()
+def get_last_month_dates(now=None):
+    """Get start and end dates for last month (relative to `now`, defaults to the current time)"""
+    now = now or datetime.now()
     if now.month == 1:
         last_month = 12
         last_year = now.year - 1
@@ -11,10 +11,12 @@ Usage examples:
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Import our utility functions
 from cml_usage_utils import (
+    get_cml_client,
     get_resource_usage_data, 
     export_to_csv, 
     create_combined_csv,
@@ -23,13 +25,13 @@ from cml_usage_utils import (
     get_month_dates
 )
 
-def parse_arguments():
-    """Parse command line arguments"""
+def parse_arguments(now=None):
+    """Parse command line arguments (`now` is the run's start time, defaults to the current time)"""
     args = sys.argv[1:]
     
     if len(args) == 0:
         # Current month to date
-        now = datetime.now()
+        now = now or datetime.now()
         start_date = datetime(now.year, now.month, 1)
         end_date = now
         period_label = f"{now.year}-{now.month:02d} (to date)"
@@ -67,9 +69,12 @@ def main():
     print("CML CUSTOM USAGE REPORT")
     print("=" * 60)
     
+    # Single run timestamp shared by the period end (month to date) and report metadata
+    run_started = datetime.now()
+    
     # Parse arguments
     try:
-        start_date, end_date, period_label = parse_arguments()
+        start_date, end_date, period_label = parse_arguments(run_started)
     except Exception as e:
         print(f"❌ Error parsing arguments: {e}")
         sys.exit(1)
@@ -83,7 +88,7 @@ def main():
     # Initialize report data
     report = {
         'report_metadata': {
-            'generated_at': datetime.now().isoformat(),
+            'generated_at': run_started.isoformat(),
             'report_period': period_label,
             'start_date': start_date.isoformat(),
             'end_date': end_date.isoformat(),
@@ -100,11 +105,19 @@ def main():
     
     print(f"\n📊 Collecting usage data...")
     
-    # Collect data for each resource type
+    # Fetch all resource types concurrently - each call is dominated by API latency
+    client = get_cml_client()
+    with ThreadPoolExecutor(max_workers=len(resource_types)) as executor:
+        futures = {
+            resource_type: executor.submit(get_resource_usage_data, resource_type, start_date, end_date, client)
+            for resource_type in resource_types
+        }
+    
+    # Process results for each resource type in order
     for resource_type in resource_types:
         print(f"\n  Processing {resource_type.upper()}...")
         
-        usage_data = get_resource_usage_data(resource_type, start_date, end_date)
+        usage_data = futures[resource_type].result()
         report['resource_usage'][resource_type] = usage_data
         
         if usage_data['success']:
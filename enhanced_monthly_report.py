@@ -1,20 +1,205 @@
 import os
 import sys
-import cmlapi
+import json
+import itertools
+import operator
+import numpy as np
 import pandas as pd
-from datetime import datetime, date
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, date, timedelta
 
-def get_last_month_dates():
-    """Calculates the start and end dates for the previous month."""
-    today = date.today()
+from cml_usage_utils import get_cml_client
+
+def get_last_month_dates(today=None):
+    """Calculates the start and end dates for the previous month (relative to `today`, defaults to the current date)."""
+    today = today or date.today()
     first_day_of_current_month = today.replace(day=1)
     end_date_of_last_month = first_day_of_current_month - pd.Timedelta(days=1)
     start_date_of_last_month = end_date_of_last_month.replace(day=1)
     return start_date_of_last_month, end_date_of_last_month
 
+# listUsage page size - the value confirmed to work against the API
+PAGE_SIZE = 1000
+
+# Daily listUsage page chains fetched concurrently when the API filters by date
+FETCH_WORKERS = 8
+
+# Slack on each side of a server-side date filter. The API may read the naive
+# bounds in its own timezone (UTC offsets span -12h to +14h), so chains ask for
+# a wider range and cut records to the exact range locally.
+FILTER_MARGIN = timedelta(hours=14)
+
+# Columns the summary reports are grouped by
+SUMMARY_GROUP_KEYS = ('creator_username', 'project_name', 'workload_type')
+
+# Summary totals are written with two decimals
+SUMMARY_FLOAT_FORMAT = '%.2f'
+
+# listUsage record fields used by the reports
+USAGE_COLUMNS = (
+    'id', 'creator', 'project_name', 'workload_type', 'status',
+    'cpu', 'memory', 'nvidia_gpu', 'duration', 'created_at'
+)
+
+# Reads every USAGE_COLUMNS field of a record as one tuple
+_usage_fields = operator.attrgetter(*USAGE_COLUMNS)
+
+def _list_usage_page(client, page_token=None, search_filter=None):
+    """Fetches a single page of usage records, optionally filtered server-side."""
+    kwargs = {'page_size': PAGE_SIZE}
+    if page_token:
+        kwargs['page_token'] = page_token
+    if search_filter:
+        kwargs['search_filter'] = search_filter
+    return client.list_usage(**kwargs)
+
+def _date_filter(start_datetime, end_datetime):
+    """Builds the listUsage search filter for a datetime range, widened by FILTER_MARGIN."""
+    # Same time range filter format cml_usage_utils sends to the time series API
+    return json.dumps({
+        "created_time": {
+            "min": (start_datetime - FILTER_MARGIN).strftime("%Y-%m-%d %H:%M:%S"),
+            "max": (end_datetime + FILTER_MARGIN).strftime("%Y-%m-%d %H:%M:%S")
+        }
+    })
+
+def _created_in_window(records, window_start, window_end):
+    """Returns the records' created_at timestamps (UTC) and a mask of those within the window."""
+    created_at = pd.to_datetime(
+        [getattr(record, 'created_at', None) for record in records],
+        errors='coerce', utc=True
+    )
+    return created_at, np.asarray((created_at >= window_start) & (created_at <= window_end))
+
+def _search_filter_honoured(client, start_datetime, end_datetime, search_filter):
+    """
+    Checks that the API actually applies a usage date filter, not just accepts it.
+    
+    The first filtered page must hold only records inside the filtered range
+    (the range plus FILTER_MARGIN), and must leave out records an unfiltered
+    first page returns - either fewer records, or unfiltered records that fall
+    outside that range.
+    
+    Returns:
+        tuple: (whether the filter is applied, the unfiltered first page or None).
+            The page can be reused to start an unfiltered fetch.
+    """
+    window_start = pd.Timestamp(start_datetime - FILTER_MARGIN, tz='UTC')
+    window_end = pd.Timestamp(end_datetime + FILTER_MARGIN, tz='UTC')
+    try:
+        # The unfiltered request is the known-working one, so make it first
+        first_page = _list_usage_page(client)
+    except Exception:
+        # Leave the error to the regular fetch, which reports it
+        return False, None
+    try:
+        filtered = _list_usage_page(client, search_filter=search_filter).usage_response or []
+    except Exception as e:
+        print(f"  Server-side date filter not accepted ({e}); filtering all usage locally", file=sys.stderr)
+        return False, first_page
+    unfiltered = first_page.usage_response or []
+    
+    filtered_in_window = _created_in_window(filtered, window_start, window_end)[1]
+    unfiltered_in_window = _created_in_window(unfiltered, window_start, window_end)[1]
+    honoured = (
+        len(filtered) > 0
+        and filtered_in_window.all()
+        and (len(filtered) < len(unfiltered) or not unfiltered_in_window.all())
+    )
+    if not honoured:
+        print("  Server-side date filter not applied by the API; filtering all usage locally", file=sys.stderr)
+    return honoured, first_page
+
+def _fetch_usage_records(client, start_datetime, end_datetime, search_filter=None, first_page=None):
+    """
+    Pages through listUsage and collects the records created within a datetime range.
+    
+    Args:
+        client: The CML API client.
+        start_datetime (datetime.datetime): Start of the range (inclusive).
+        end_datetime (datetime.datetime): End of the range (inclusive).
+        search_filter (str): Optional server-side filter sent with every page.
+        first_page: Optional already fetched first page to start from.
+    
+    Returns:
+        tuple: (dict of one list per USAGE_COLUMNS field, number of records).
+    """
+    # Fields of matching records are streamed straight into one list per column
+    columns = {col: [] for col in USAGE_COLUMNS}
+    record_count = 0
+    page_count = 0
+    window_label = f"{start_datetime:%Y-%m-%d}..{end_datetime:%Y-%m-%d}"
+    # Usage timestamps are UTC, so compare against UTC-aware bounds built once
+    # instead of stripping the timezone from every record
+    window_start = pd.Timestamp(start_datetime, tz='UTC')
+    window_end = pd.Timestamp(end_datetime, tz='UTC')
+    
+    # Pages are chained by opaque tokens, so prefetch: as soon as a page arrives,
+    # request the next one in the background while this one is filtered.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        if first_page is not None:
+            next_page = Future()
+            next_page.set_result(first_page)
+        else:
+            next_page = executor.submit(_list_usage_page, client, None, search_filter)
+        
+        while next_page is not None:
+            try:
+                usage_list = next_page.result()
+                next_page = None
+                
+                page_count += 1
+                
+                # Check for more pages and start fetching the next one
+                page_token = usage_list.next_page_token
+                if page_token:
+                    next_page = executor.submit(_list_usage_page, client, page_token, search_filter)
+                
+                # Filter the records by date as a whole page: one vectorized
+                # mask instead of a Python comparison per record
+                records = usage_list.usage_response
+                if records:
+                    created_at, in_window = _created_in_window(records, window_start, window_end)
+                    
+                    # Only touch the other fields of matching records; server-filtered
+                    # pages normally match entirely and skip the selection
+                    added = int(in_window.sum())
+                    if added < len(records):
+                        records = list(itertools.compress(records, in_window))
+                    try:
+                        # One C-level attrgetter call per record, then transpose to columns
+                        rows = list(map(_usage_fields, records))
+                    except AttributeError:
+                        # Older SDK models may lack a field - fall back to tolerant access
+                        rows = [tuple(getattr(record, col, None) for col in USAGE_COLUMNS) for record in records]
+                    for col, values in zip(USAGE_COLUMNS, zip(*rows)):
+                        columns[col].extend(values)
+                    record_count += added
+                    print(f"  [{window_label}] Page {page_count}: added {added} records")
+                    
+                    # Usage listed newest-first: once a whole page predates the
+                    # window, every later page does too
+                    dated = created_at[created_at.notna()]
+                    newest_first = not (np.diff(dated.asi8) > 0).any()
+                    if next_page is not None and dated.size and newest_first and (dated < window_start).all():
+                        print(f"  [{window_label}] Reached records older than the window, stopping")
+                        next_page.cancel()
+                        next_page = None
+                    
+            except Exception as e:
+                print(f"Error calling CML API: {e}", file=sys.stderr)
+                break
+    
+    return columns, record_count
+
 def get_usage_data(start_time, end_time):
     """
-    Fetches all CML usage data and filters manually by date range.
+    Fetches CML usage data for a date range.
+    
+    When the API is confirmed to apply a date search filter, the range is split
+    into daily windows whose page chains are fetched concurrently. Otherwise
+    all usage is paged through in one chain. Records are always re-checked
+    against the range locally.
     
     Args:
         start_time (datetime.date): The start date of the report.
@@ -23,121 +208,223 @@ def get_usage_data(start_time, end_time):
     Returns:
         pandas.DataFrame: A DataFrame containing all usage records for the period.
     """
-    client = cmlapi.default_client()
+    client = get_cml_client()
     
     print(f"Fetching usage data and filtering for {start_time} to {end_time}...")
     
-    all_usage_records = []
-    page_token = None
-    page_count = 0
-    
     # Convert dates to datetime objects for comparison
     start_datetime = datetime.combine(start_time, datetime.min.time())
     end_datetime = datetime.combine(end_time, datetime.max.time())
     
-    while True:
-        try:
-            # Use the working API call format (no search_filter!)
-            if page_token:
-                usage_list = client.list_usage(page_size=1000, page_token=page_token)
-            else:
-                usage_list = client.list_usage(page_size=1000)
-            
-            page_count += 1
-            print(f"  Processing page {page_count}...")
-            
-            # Filter the records manually by date
-            if usage_list.usage_response:
-                filtered_records = []
-                for record in usage_list.usage_response:
-                    # The debug showed created_at is already a datetime object
-                    if hasattr(record, 'created_at') and record.created_at:
-                        # Remove timezone info for comparison if present
-                        record_datetime = record.created_at
-                        if record_datetime.tzinfo is not None:
-                            record_datetime = record_datetime.replace(tzinfo=None)
-                        
-                        if start_datetime <= record_datetime <= end_datetime:
-                            filtered_records.append(record)
-                
-                all_usage_records.extend(filtered_records)
-                print(f"    Added {len(filtered_records)} records from this page")
-            
-            # Check for more pages
-            page_token = usage_list.next_page_token
-            if not page_token:
-                break
-                
-        except Exception as e:
-            print(f"Error calling CML API: {e}", file=sys.stderr)
-            break
-            
-    print(f"Successfully fetched {len(all_usage_records)} records for the specified period.")
+    filter_honoured, first_page = _search_filter_honoured(
+        client, start_datetime, end_datetime, _date_filter(start_datetime, end_datetime)
+    )
+    if filter_honoured:
+        # Each day is an independent page chain, so the chains can overlap their round trips.
+        # Neighbouring chains' server ranges overlap by the filter margin, but each
+        # keeps only its own exact day, so no record is dropped or duplicated.
+        windows = [
+            (day_start, datetime.combine(day_start.date(), datetime.max.time()))
+            for day_start in (start_datetime + timedelta(days=i) for i in range((end_time - start_time).days + 1))
+        ]
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            results = list(executor.map(
+                lambda window: _fetch_usage_records(client, window[0], window[1], _date_filter(*window)),
+                windows
+            ))
+    else:
+        # Continue from the probe's unfiltered page instead of fetching it again
+        results = [_fetch_usage_records(client, start_datetime, end_datetime, first_page=first_page)]
+    
+    # Merge the per-window columns newest day first, matching the API's
+    # newest-first order of a single unfiltered page chain
+    columns = {col: [] for col in USAGE_COLUMNS}
+    for window_columns, _ in reversed(results):
+        for col in USAGE_COLUMNS:
+            columns[col].extend(window_columns[col])
+    record_count = sum(count for _, count in results)
+    
+    print(f"Successfully fetched {record_count} records for the specified period.")
     
     # Convert to DataFrame using the structure we discovered
-    if not all_usage_records:
+    if not record_count:
         return pd.DataFrame()
     
-    records_data = []
-    for record in all_usage_records:
-        record_dict = record.to_dict()
-        records_data.append(record_dict)
+    # Build as plain object columns: process_usage_df applies the real types
+    # explicitly, so pandas' per-column type inference here would be wasted work
+    return pd.DataFrame(columns, columns=list(USAGE_COLUMNS), dtype=object)
+
+def _resource_hours(duration, cpu, memory, gpu):
+    """
+    Computes the per-workload resource-hour metrics from float64 input arrays.
+    
+    Every output is allocated once and filled by a single ufunc pass, with no
+    intermediate temporaries. The arithmetic matches the original pandas
+    expressions, so the exported values are unchanged.
+    
+    Returns:
+        dict: duration_hours, cpu_hours, gpu_hours and memory_gb_hours arrays.
+    """
+    duration_hours = np.divide(duration, 3600.0)
+    cpu_hours = np.multiply(cpu, duration_hours)
+    gpu_hours = np.multiply(gpu, duration_hours)
+    
+    # Convert bytes to GB, then scale by duration in place
+    memory_gb_hours = np.divide(memory, 1024**3)
+    np.multiply(memory_gb_hours, duration_hours, out=memory_gb_hours)
     
-    return pd.DataFrame(records_data)
+    return {
+        'duration_hours': duration_hours,
+        'cpu_hours': cpu_hours,
+        'gpu_hours': gpu_hours,
+        'memory_gb_hours': memory_gb_hours,
+    }
 
 def process_usage_df(df):
     """Cleans and enhances the raw usage DataFrame with calculated metrics."""
     if df.empty:
         return df
     
-    # Convert numeric fields - we know the exact field names now
-    numeric_columns = ['cpu', 'memory', 'nvidia_gpu']
-    for col in numeric_columns:
-        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+    # Convert numeric fields once and keep the raw arrays for the metric math.
+    # duration came as string "0" in the debug, so coerce it like the others.
+    cpu = pd.to_numeric(df['cpu'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+    memory = pd.to_numeric(df['memory'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+    gpu = pd.to_numeric(df['nvidia_gpu'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+    duration = pd.to_numeric(df['duration'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
     
-    # Convert duration - it came as string "0" in the debug
-    df['duration'] = pd.to_numeric(df['duration'], errors='coerce').fillna(0)
+    df['cpu'] = cpu
+    df['memory'] = memory
+    df['nvidia_gpu'] = gpu
+    df['duration'] = duration
     
     # created_at is already a datetime, just ensure it
     df['created_at'] = pd.to_datetime(df['created_at'], errors='coerce')
     
-    # Extract usernames from the structures we saw in debug
-    df['creator_username'] = df['creator']  # This was already a plain string
-    df['project_name'] = df['project_name']  # This was already a plain string
+    # creator and project_name already arrive as plain strings, so no per-row
+    # extraction is needed - just relabel creator as the report column
+    df.rename(columns={'creator': 'creator_username'}, inplace=True)
     
-    # Calculate resource-hour metrics
-    df['duration_hours'] = df['duration'] / 3600.0
-    df['cpu_hours'] = df['cpu'] * df['duration_hours'] 
-    df['gpu_hours'] = df['nvidia_gpu'] * df['duration_hours']
-    df['memory_gb_hours'] = (df['memory'] / (1024**3)) * df['duration_hours']  # Convert bytes to GB
+    # Factorize the low-cardinality string columns once: the summary reports
+    # reuse the category codes, and status shrinks to small integer codes
+    for col in SUMMARY_GROUP_KEYS + ('status',):
+        df[col] = df[col].astype('category')
+    
+    # Calculate resource-hour metrics directly on the arrays
+    for col, values in _resource_hours(duration, cpu, memory, gpu).items():
+        df[col] = values
     
     return df
 
+def _aggregate_by(combos, key, **sums):
+    """
+    Rolls the pre-aggregated combinations up to one row per value of `key`.
+    
+    Args:
+        combos (pandas.DataFrame): Output of _combine_groups; `key` is categorical.
+        key (str): Column to group by. Rows with a missing key are dropped.
+        **sums: name=column pairs, each summed per key value with np.bincount.
+    
+    Returns:
+        pandas.DataFrame: One row per key category, indexed by `key`.
+    """
+    keys = combos[key]
+    labels = keys.cat.categories
+    codes = keys.cat.codes.to_numpy()
+    valid = codes >= 0
+    codes = codes[valid]
+    
+    result = {}
+    for name, column in sums.items():
+        values = combos[column].to_numpy()
+        total = np.bincount(codes, weights=values[valid], minlength=len(labels))
+        # Sums of integer columns (the workload counts) stay integers
+        result[name] = total.astype(np.int64) if np.issubdtype(values.dtype, np.integer) else total
+    
+    return pd.DataFrame(result, index=pd.Index(labels, name=key))
+
+def _combine_groups(df, keys, sum_columns, count_column):
+    """
+    Pre-aggregates the usage data per combination of `keys` in one pass over the rows.
+    
+    The per-key codes are packed into a single integer per row, so each summed
+    column needs only one np.bincount over the full data. Reports grouped by
+    any one of the keys can then be rolled up from the (much smaller) result.
+    
+    Args:
+        df (pandas.DataFrame): The processed usage data.
+        keys (tuple): Categorical columns whose value combinations form the groups.
+        sum_columns (tuple): Columns to sum per combination.
+        count_column (str): Column whose non-null values are counted as 'workloads'.
+    
+    Returns:
+        pandas.DataFrame: One row per observed combination, with the key columns
+            as categoricals (missing keys kept as NaN), the summed columns and
+            an integer 'workloads' count.
+    """
+    key_categories = []
+    packed = np.zeros(len(df), dtype=np.int64)
+    for key in keys:
+        # The keys were made categorical once in process_usage_df
+        values = df[key]
+        # Shift codes by one so missing keys (-1) get their own slot
+        packed = packed * (len(values.cat.categories) + 1) + (values.cat.codes.to_numpy().astype(np.int64) + 1)
+        key_categories.append(values.cat.categories)
+    
+    combo_codes, combos = pd.factorize(packed)
+    n_combos = len(combos)
+    
+    # Unpack each combination back into its per-key codes
+    result = {}
+    remaining = combos
+    for key, categories in reversed(list(zip(keys, key_categories))):
+        radix = len(categories) + 1
+        result[key] = pd.Categorical.from_codes(remaining % radix - 1, categories=categories)
+        remaining = remaining // radix
+    
+    for column in sum_columns:
+        weights = df[column].to_numpy(dtype=np.float64)
+        result[column] = np.bincount(combo_codes, weights=weights, minlength=n_combos)
+    weights = df[count_column].notna().to_numpy()
+    result['workloads'] = np.bincount(combo_codes, weights=weights, minlength=n_combos).astype(np.int64)
+    
+    return pd.DataFrame(result, columns=list(keys) + list(sum_columns) + ['workloads'])
+
 def generate_summary_reports(df):
     """Generates several aggregated summary reports from the detailed usage data."""
     if df.empty:
         empty_df = pd.DataFrame()
         return empty_df, empty_df, empty_df
     
-    user_report = df.groupby('creator_username').agg(
-        total_cpu_hours=('cpu_hours', 'sum'),
-        total_memory_gb_hours=('memory_gb_hours', 'sum'),
-        total_gpu_hours=('gpu_hours', 'sum'),
-        total_workloads=('id', 'count')
-    ).round(2).sort_values(by='total_cpu_hours', ascending=False)
-    
-    project_report = df.groupby('project_name').agg(
-        total_cpu_hours=('cpu_hours', 'sum'),
-        total_memory_gb_hours=('memory_gb_hours', 'sum'),
-        total_gpu_hours=('gpu_hours', 'sum'),
-        total_workloads=('id', 'count')
-    ).round(2).sort_values(by='total_cpu_hours', ascending=False)
-    
-    workload_report = df.groupby('workload_type').agg(
-        total_cpu_hours=('cpu_hours', 'sum'),
-        total_gpu_hours=('gpu_hours', 'sum'),
-        total_runs=('id', 'count')
-    ).round(2).sort_values(by='total_runs', ascending=False)
+    # Aggregate the rows once per (user, project, workload type); each report
+    # below only rolls up these combinations
+    combos = _combine_groups(
+        df, SUMMARY_GROUP_KEYS,
+        sum_columns=('cpu_hours', 'memory_gb_hours', 'gpu_hours'),
+        count_column='id'
+    )
+    
+    user_report = _aggregate_by(
+        combos, 'creator_username',
+        total_cpu_hours='cpu_hours',
+        total_memory_gb_hours='memory_gb_hours',
+        total_gpu_hours='gpu_hours',
+        total_workloads='workloads'
+    ).sort_values(by='total_cpu_hours', ascending=False)
+    
+    project_report = _aggregate_by(
+        combos, 'project_name',
+        total_cpu_hours='cpu_hours',
+        total_memory_gb_hours='memory_gb_hours',
+        total_gpu_hours='gpu_hours',
+        total_workloads='workloads'
+    ).sort_values(by='total_cpu_hours', ascending=False)
+    
+    workload_report = _aggregate_by(
+        combos, 'workload_type',
+        total_cpu_hours='cpu_hours',
+        total_gpu_hours='gpu_hours',
+        total_runs='workloads'
+    ).sort_values(by='total_runs', ascending=False)
     
     return user_report, project_report, workload_report
 
@@ -147,8 +434,12 @@ def main():
     print("CML ENHANCED MONTHLY USAGE REPORT (listUsage API - Fixed)")
     print("=" * 60)
     
-    start_date, end_date = get_last_month_dates()
+    # Single run timestamp for the report period and every output file's stamp
+    run_started = datetime.now()
+    
+    start_date, end_date = get_last_month_dates(run_started.date())
     report_period = start_date.strftime("%Y-%m")
+    timestamp = run_started.strftime("%Y%m%d")
     
     # Set the output directory to 'reports'
     OUTPUT_DIR = "reports"
@@ -168,37 +459,55 @@ def main():
     # 2. Generate summary reports
     user_report, project_report, workload_report = generate_summary_reports(processed_df)
     
-    # 3. Print summaries to console
-    print("\n--- Top 5 User Consumption ---")
-    print(user_report.head())
-    print("\n--- Top 5 Project Consumption ---") 
-    print(project_report.head())
-    print("\n--- Consumption by Workload Type ---")
-    print(workload_report)
+    # 3. Print summaries to console (rounded for display only)
+    with pd.option_context('display.float_format', '{:.2f}'.format):
+        print("\n--- Top 5 User Consumption ---")
+        print(user_report.head())
+        print("\n--- Top 5 Project Consumption ---") 
+        print(project_report.head())
+        print("\n--- Consumption by Workload Type ---")
+        print(workload_report)
 
     # 4. Export reports to CSV
-    timestamp = datetime.now().strftime("%Y%m%d")
-    
     # Export detailed, granular data
     detailed_cols = [
         'created_at', 'creator_username', 'project_name', 'workload_type', 
         'status', 'duration_hours', 'cpu_hours', 'memory_gb_hours', 'gpu_hours'
     ]
     detailed_filename = f"{OUTPUT_DIR}/{report_period}_detailed_usage_{timestamp}.csv"
-    processed_df[detailed_cols].to_csv(detailed_filename, index=False)
     
     # Export aggregated reports
     user_filename = f"{OUTPUT_DIR}/{report_period}_user_summary_{timestamp}.csv"
     project_filename = f"{OUTPUT_DIR}/{report_period}_project_summary_{timestamp}.csv"
     workload_filename = f"{OUTPUT_DIR}/{report_period}_workload_summary_{timestamp}.csv"
     
-    user_report.to_csv(user_filename)
-    project_report.to_csv(project_filename)
-    workload_report.to_csv(workload_filename)
+    # The files are independent, so write them concurrently to overlap disk I/O
+    exports = [
+        (processed_df[detailed_cols], detailed_filename, {'index': False}),
+        (user_report, user_filename, {'float_format': SUMMARY_FLOAT_FORMAT}),
+        (project_report, project_filename, {'float_format': SUMMARY_FLOAT_FORMAT}),
+        (workload_report, workload_filename, {'float_format': SUMMARY_FLOAT_FORMAT}),
+    ]
+    with ThreadPoolExecutor(max_workers=len(exports)) as executor:
+        futures = [executor.submit(frame.to_csv, filename, **options) for frame, filename, options in exports]
+        for future in futures:
+            future.result()  # Re-raise any write error
+    
+    # Optionally export the detailed data as Parquet for pandas/Spark consumers
+    parquet_filename = None
+    if '--parquet' in sys.argv[1:]:
+        parquet_filename = detailed_filename.replace('.csv', '.parquet')
+        try:
+            processed_df[detailed_cols].to_parquet(parquet_filename, index=False, compression='snappy')
+        except ImportError as e:
+            print(f"⚠️ Skipping Parquet export (install pyarrow to enable it): {e}", file=sys.stderr)
+            parquet_filename = None
     
     print("\n" + "=" * 60)
     print(f"✅ Reports successfully generated in the '{OUTPUT_DIR}' directory.")
     print(f"   - {detailed_filename}")
+    if parquet_filename:
+        print(f"   - {parquet_filename}")
     print(f"   - {user_filename}")
     print(f"   - {project_filename}")
     print(f"   - {workload_filename}")
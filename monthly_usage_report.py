@@ -11,10 +11,12 @@ This script generates usage reports for the previous month and exports:
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Import our utility functions
 from cml_usage_utils import (
+    get_cml_client,
     get_resource_usage_data, 
     export_to_csv, 
     create_combined_csv,
@@ -30,8 +32,11 @@ def main():
     print("CML MONTHLY USAGE REPORT")
     print("=" * 60)
     
+    # Single run timestamp for the report period and metadata
+    run_started = datetime.now()
+    
     # Get last month's date range
-    start_date, end_date, year, month = get_last_month_dates()
+    start_date, end_date, year, month = get_last_month_dates(run_started)
     
     print(f"📅 Generating report for: {year}-{month:02d}")
     print(f"📅 Period: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
@@ -39,7 +44,7 @@ def main():
     # Initialize report data
     report = {
         'report_metadata': {
-            'generated_at': datetime.now().isoformat(),
+            'generated_at': run_started.isoformat(),
             'report_period': f"{year}-{month:02d}",
             'start_date': start_date.isoformat(),
             'end_date': end_date.isoformat(),
@@ -56,11 +61,19 @@ def main():
     
     print(f"\n📊 Collecting usage data...")
     
-    # Collect data for each resource type
+    # Fetch all resource types concurrently - each call is dominated by API latency
+    client = get_cml_client()
+    with ThreadPoolExecutor(max_workers=len(resource_types)) as executor:
+        futures = {
+            resource_type: executor.submit(get_resource_usage_data, resource_type, start_date, end_date, client)
+            for resource_type in resource_types
+        }
+    
+    # Process results for each resource type in order
     for resource_type in resource_types:
         print(f"\n  Processing {resource_type.upper()}...")
         
-        usage_data = get_resource_usage_data(resource_type, start_date, end_date)
+        usage_data = futures[resource_type].result()
         report['resource_usage'][resource_type] = usage_data
         
         if usage_data['success']: